@@ -5,8 +5,10 @@ Flask web application for EIS fitting.
 import logging
 
 from flask import Flask, render_template
+from flask_compress import Compress
 
 from eisy.data.models import CIRCUIT_MODELS
+from eisy.web.json_provider import ORJSONProvider
 from eisy.web.routes import register_routes
 
 
@@ -19,6 +21,18 @@ def create_app(debug: bool = False):
         static_url_path="/static",
     )
 
+    app.json = ORJSONProvider(app)
+
+    # Cap request bodies so a single oversized upload can't exhaust memory
+    app.config["MAX_CONTENT_LENGTH"] = 32 << 20
+
+    # Compress large JSON array payloads, preferring brotli when accepted
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_MIN_SIZE"] = 4096
+    app.config["COMPRESS_LEVEL"] = 4
+    app.config["COMPRESS_BR_LEVEL"] = 4
+    Compress(app)
+
     # Configure logging
     if debug:
         app.logger.setLevel(logging.DEBUG)
@@ -36,10 +50,18 @@ def create_app(debug: bool = False):
     return app
 
 
-# Create the app instance
-app = create_app(debug=True)
+def __getattr__(name):
+    """Build the module-level debug app on first access.
+
+    Deferring it means importing create_app (e.g. from eisy.asgi) does not
+    build a second app as a side effect.
+    """
+    if name == "app":
+        globals()["app"] = create_app(debug=True)
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
+    create_app(debug=True).run(debug=True, port=5000)
 
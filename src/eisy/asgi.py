@@ -0,0 +1,19 @@
+"""
+ASGI entry point for serving the web application.
+
+Flask is a WSGI app; a2wsgi's WSGIMiddleware runs each request on a pool of
+WSGI_THREADS threads, so quick requests are still served while a long fit is
+running. For CPU parallelism across fits, also run several server processes,
+e.g.:
+
+    uvicorn eisy.asgi:asgi_app --workers 4
+"""
+
+from a2wsgi import WSGIMiddleware
+
+from eisy.app import create_app
+
+# Requests handled concurrently by each server process
+WSGI_THREADS = 8
+
+asgi_app = WSGIMiddleware(create_app(), workers=WSGI_THREADS)
@@ -0,0 +1,134 @@
+"""
+Compiled evaluation of circuit trees.
+
+A parsed circuit is linearized into a postfix instruction stream that a single
+Numba-compiled stack machine evaluates over the whole frequency vector. Numba
+is optional: without it, HAVE_NUMBA is False and callers keep using the
+recursive CircuitNode.impedance traversal.
+"""
+
+import cmath
+
+import numpy as np
+
+from .elements import (
+    CPE,
+    Capacitor,
+    Inductor,
+    Resistor,
+    Warburg,
+    WarburgOpen,
+    WarburgShort,
+)
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Opcodes: element loads take the offset of their first parameter, combinators
+# take the number of operands to pop from the stack.
+LOAD_R = 0
+LOAD_C = 1
+LOAD_L = 2
+LOAD_W = 3
+LOAD_S = 4
+LOAD_O = 5
+LOAD_Q = 6
+SERIES = 7
+PARALLEL = 8
+
+ELEMENT_OPCODES = {
+    Resistor: LOAD_R,
+    Capacitor: LOAD_C,
+    Inductor: LOAD_L,
+    Warburg: LOAD_W,
+    WarburgShort: LOAD_S,
+    WarburgOpen: LOAD_O,
+    CPE: LOAD_Q,
+}
+
+
+@njit(cache=True)
+def eval_residuals(ops, args, params, omega, Z_real, Z_imag, stack, out):
+    """
+    Evaluate a linearized circuit program as fit residuals.
+
+    The real and imaginary parts of the model are written straight into the
+    two halves of the residual vector, with no intermediate complex array.
+
+    Args:
+        ops (array): Opcodes of the program, in postfix order.
+        args (array): Operand of each opcode (parameter offset or arity).
+        params (array): Flat parameter vector.
+        omega (array): Angular frequencies.
+        Z_real (array): Real part of the experimental impedance.
+        Z_imag (array): Imaginary part of the experimental impedance.
+        stack (array): Complex workspace of shape (len(ops), len(omega)).
+        out (array): Residual vector of length 2 * len(omega).
+    """
+    _run_program(ops, args, params, omega, stack)
+    n = omega.shape[0]
+    for j in range(n):
+        Z = stack[0, j]
+        out[j] = Z.real - Z_real[j]
+        out[n + j] = Z.imag - Z_imag[j]
+
+
+@njit(cache=True)
+def _run_program(ops, args, params, omega, stack):
+    # Leaves the circuit impedance in stack[0]
+    n = omega.shape[0]
+    sp = 0
+    for i in range(ops.shape[0]):
+        op = ops[i]
+        a = args[i]
+        if op == SERIES:
+            sp -= a
+            for j in range(n):
+                acc = 0j
+                for k in range(a):
+                    acc += stack[sp + k, j]
+                stack[sp, j] = acc
+        elif op == PARALLEL:
+            sp -= a
+            for j in range(n):
+                acc = 0j
+                for k in range(a):
+                    acc += 1 / stack[sp + k, j]
+                stack[sp, j] = 1 / acc
+        elif op == LOAD_R:
+            for j in range(n):
+                stack[sp, j] = params[a]
+        elif op == LOAD_C:
+            for j in range(n):
+                stack[sp, j] = 1 / (1j * omega[j] * params[a])
+        elif op == LOAD_L:
+            for j in range(n):
+                stack[sp, j] = 1j * omega[j] * params[a]
+        elif op == LOAD_W:
+            for j in range(n):
+                stack[sp, j] = params[a] * (1 - 1j) / np.sqrt(omega[j])
+        elif op == LOAD_S:
+            for j in range(n):
+                sqrt_jw = cmath.sqrt(1j * omega[j])
+                stack[sp, j] = params[a] * cmath.tanh(params[a + 1] * sqrt_jw) / sqrt_jw
+        elif op == LOAD_O:
+            for j in range(n):
+                sqrt_jw = cmath.sqrt(1j * omega[j])
+                stack[sp, j] = params[a] / (
+                    cmath.tanh(params[a + 1] * sqrt_jw) * sqrt_jw
+                )
+        elif op == LOAD_Q:
+            for j in range(n):
+                stack[sp, j] = 1 / (params[a] * (1j * omega[j]) ** params[a + 1])
+        sp += 1
@@ -2,83 +2,182 @@ import numpy as np
 
 
 def coth(x):
-    """Compute the hyperbolic cotangent of x."""
-    return 1 / np.tanh(x)
+    """
+    Compute the hyperbolic cotangent of x.
+
+    Uses coth(x) = (1 + e^-2x) / (1 - e^-2x), which is stable for Re(x) > 0:
+    e^-2x underflows cleanly for large arguments and expm1 keeps precision
+    for small ones. coth is odd, so Re(x) < 0 is folded onto Re(x) > 0.
+    """
+    sign = np.where(np.real(x) < 0, -1, 1)
+    em1 = np.expm1(-2 * sign * x)
+    return sign * (2 + em1) / -em1
+
+
+def frequency_context(frequency) -> dict:
+    """
+    Precompute the frequency-dependent terms shared by circuit elements.
+
+    sqrt_jw and log_jw are only needed by Warburg S/O and CPE elements, so
+    they are added on first use by _sqrt_jw and _log_jw.
+
+    Args:
+        frequency (float or array): Frequency value(s) in Hz.
+
+    Returns:
+        dict: Context with keys omega and jw.
+    """
+    omega = 2 * np.pi * frequency
+    return {"omega": omega, "jw": 1j * omega}
+
+
+def _sqrt_jw(frequency, ctx):
+    if ctx is None:
+        return np.sqrt(1j * 2 * np.pi * frequency)
+    if "sqrt_jw" not in ctx:
+        ctx["sqrt_jw"] = np.sqrt(ctx["jw"])
+    return ctx["sqrt_jw"]
+
+
+def _log_jw(frequency, ctx):
+    if ctx is None:
+        return np.log(1j * 2 * np.pi * frequency)
+    if "log_jw" not in ctx:
+        ctx["log_jw"] = np.log(ctx["jw"])
+    return ctx["log_jw"]
 
 
 class CircuitElement:
     def __init__(self, name=None):
         self.name = name
 
-    def impedance(self, frequency: float) -> complex:
+    def impedance(self, frequency: float, params, ctx: dict = None) -> complex:
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def gradient(self, frequency: float, params, ctx: dict = None) -> tuple:
+        """Return the derivatives of the impedance w.r.t. each parameter."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def impedance_and_gradient(self, frequency: float, params, ctx: dict = None):
+        """Return (impedance, gradient), sharing intermediate terms if possible."""
+        return (
+            self.impedance(frequency, params, ctx),
+            self.gradient(frequency, params, ctx),
+        )
+
 
 class Resistor(CircuitElement):
     def __str__(self):
         return f"R{self.name}"
 
-    def impedance(self, frequency: float, R: float) -> complex:
-        if isinstance(frequency, np.ndarray):
-            return np.full_like(frequency, R, dtype=complex)
-        else:
-            return R + 0j
+    def impedance(self, frequency: float, R: float, ctx: dict = None) -> complex:
+        # Frequency independent: a scalar broadcasts against the other elements
+        return complex(R)
+
+    def gradient(self, frequency: float, R: float, ctx: dict = None) -> tuple:
+        return (1 + 0j,)
 
 
 class Capacitor(CircuitElement):
     def __str__(self):
         return f"C{self.name}"
 
-    def impedance(self, frequency: float, C: float) -> complex:
-        omega = 2 * np.pi * frequency
-        return 1 / (1j * omega * C)
+    def impedance(self, frequency: float, C: float, ctx: dict = None) -> complex:
+        jw = ctx["jw"] if ctx is not None else 1j * 2 * np.pi * frequency
+        return 1 / (jw * C)
+
+    def gradient(self, frequency: float, C: float, ctx: dict = None) -> tuple:
+        return self.impedance_and_gradient(frequency, C, ctx)[1]
+
+    def impedance_and_gradient(self, frequency: float, C: float, ctx: dict = None):
+        Z = self.impedance(frequency, C, ctx)
+        return Z, (-Z / C,)
 
 
 class Inductor(CircuitElement):
     def __str__(self):
         return f"L{self.name}"
 
-    def impedance(self, frequency: float, L: float) -> complex:
-        omega = 2 * np.pi * frequency
-        return 1j * omega * L
+    def impedance(self, frequency: float, L: float, ctx: dict = None) -> complex:
+        jw = ctx["jw"] if ctx is not None else 1j * 2 * np.pi * frequency
+        return jw * L
+
+    def gradient(self, frequency: float, L: float, ctx: dict = None) -> tuple:
+        jw = ctx["jw"] if ctx is not None else 1j * 2 * np.pi * frequency
+        return (jw,)
 
 
 class Warburg(CircuitElement):
     def __str__(self):
         return f"W{self.name}"
 
-    def impedance(self, frequency: float, Aw: float) -> complex:
-        real_part = Aw / np.sqrt(2 * np.pi * frequency)
-        imag_part = Aw / (1j * np.sqrt(2 * np.pi * frequency))
-        return real_part + imag_part
+    def impedance(self, frequency: float, Aw: float, ctx: dict = None) -> complex:
+        omega = ctx["omega"] if ctx is not None else 2 * np.pi * frequency
+        # Aw / sqrt(w) + Aw / (1j * sqrt(w)) as a single complex construction
+        return Aw * (1 - 1j) / np.sqrt(omega)
+
+    def gradient(self, frequency: float, Aw: float, ctx: dict = None) -> tuple:
+        return (self.impedance(frequency, 1.0, ctx),)
+
+    def impedance_and_gradient(self, frequency: float, Aw: float, ctx: dict = None):
+        unit = self.impedance(frequency, 1.0, ctx)
+        return Aw * unit, (unit,)
 
 
 class WarburgShort(CircuitElement):
     def __str__(self):
         return f"S{self.name}"
 
-    def impedance(self, frequency: float, params: tuple) -> complex:
+    def impedance(self, frequency: float, params: tuple, ctx: dict = None) -> complex:
         Aw, B = params
-        omega = 2 * np.pi * frequency
-        return Aw * np.tanh(B * np.sqrt(1j * omega)) / np.sqrt(1j * omega)
+        sqrt_jw = _sqrt_jw(frequency, ctx)
+        return Aw * np.tanh(B * sqrt_jw) / sqrt_jw
+
+    def gradient(self, frequency: float, params: tuple, ctx: dict = None) -> tuple:
+        return self.impedance_and_gradient(frequency, params, ctx)[1]
+
+    def impedance_and_gradient(self, frequency: float, params: tuple, ctx: dict = None):
+        Aw, B = params
+        sqrt_jw = _sqrt_jw(frequency, ctx)
+        tanh = np.tanh(B * sqrt_jw)
+        unit = tanh / sqrt_jw
+        return Aw * unit, (unit, Aw * (1 - tanh**2))
 
 
 class WarburgOpen(CircuitElement):
     def __str__(self):
         return f"O{self.name}"
 
-    def impedance(self, frequency: float, params: tuple) -> complex:
+    def impedance(self, frequency: float, params: tuple, ctx: dict = None) -> complex:
+        Aw, B = params
+        sqrt_jw = _sqrt_jw(frequency, ctx)
+        return Aw * coth(B * sqrt_jw) / sqrt_jw
+
+    def gradient(self, frequency: float, params: tuple, ctx: dict = None) -> tuple:
+        return self.impedance_and_gradient(frequency, params, ctx)[1]
+
+    def impedance_and_gradient(self, frequency: float, params: tuple, ctx: dict = None):
         Aw, B = params
-        omega = 2 * np.pi * frequency
-        return Aw * coth(B * np.sqrt(1j * omega)) / np.sqrt(1j * omega)
+        sqrt_jw = _sqrt_jw(frequency, ctx)
+        coth_x = coth(B * sqrt_jw)
+        unit = coth_x / sqrt_jw
+        return Aw * unit, (unit, Aw * (1 - coth_x**2))
 
 
 class CPE(CircuitElement):
     def __str__(self):
         return f"Q{self.name}"
 
-    def impedance(self, frequency: float, C_n: tuple) -> complex:
+    def impedance(self, frequency: float, C_n: tuple, ctx: dict = None) -> complex:
         C, n = C_n
         if n <= 0 or n > 1:
             raise ValueError("CPE exponent n must be in the range (0, 1].")
-        return 1 / (C * (1j * 2 * np.pi * frequency) ** n)
+        # (jw)^n = exp(n * log(jw))
+        return 1 / (C * np.exp(n * _log_jw(frequency, ctx)))
+
+    def gradient(self, frequency: float, C_n: tuple, ctx: dict = None) -> tuple:
+        return self.impedance_and_gradient(frequency, C_n, ctx)[1]
+
+    def impedance_and_gradient(self, frequency: float, C_n: tuple, ctx: dict = None):
+        Z = self.impedance(frequency, C_n, ctx)
+        return Z, (-Z / C_n[0], -_log_jw(frequency, ctx) * Z)
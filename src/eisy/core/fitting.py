@@ -4,17 +4,33 @@ from .parsing import parse_circuit
 
 import logging
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 
-def best_model(models: list, freq: np.ndarray, Z_exp: np.ndarray) -> tuple:
+def _fit_one(model: str, params: dict, freq: np.ndarray, Z_exp: np.ndarray) -> tuple:
+    """Parse and fit a single circuit model (inline or in a worker process)."""
+    circuit = parse_circuit(model)
+    return circuit.fit(freq, Z_exp, params)
+
+
+def best_model(
+    models: list, freq: np.ndarray, Z_exp: np.ndarray, max_workers: int = None
+) -> tuple:
     """Select the best fitting model based on R^2 value.
 
+    Each model's params dict is updated in place with its fitted values, as
+    with CircuitNode.fit. With max_workers > 1 the models are fitted
+    concurrently in a process pool; scripts doing so need the usual
+    ``if __name__ == "__main__":`` guard on platforms that spawn workers.
+
     Args:
         models (list): List of CircuitNode models to evaluate.
         freq (array): Array of frequency values.
         Z_exp (array): Array of experimental impedance values (complex numbers).
+        max_workers (int, optional): Number of worker processes. Defaults to
+            None, which fits the models one after another in this process.
 
     Returns:
         tuple: A tuple containing the best model and its fitted parameters.
@@ -25,22 +41,40 @@ def best_model(models: list, freq: np.ndarray, Z_exp: np.ndarray) -> tuple:
 
     failed_models = []
 
-    for model, params in models:
-        try:
-            circuit = parse_circuit(model)
-            fitted_params, r_squared = circuit.fit(freq, Z_exp, params)
-
-            if r_squared > best_r_squared:
-                best_r_squared = r_squared
-                best_model = (model, r_squared)
-                best_params = fitted_params
+    if max_workers is not None and max_workers > 1 and len(models) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(models))) as executor:
+            futures = [
+                executor.submit(_fit_one, model, params, freq, Z_exp)
+                for model, params in models
+            ]
+        outcomes = [future.exception() or future.result() for future in futures]
+    else:
+        outcomes = []
+        for model, params in models:
+            try:
+                outcomes.append(_fit_one(model, params, freq, Z_exp))
+            except Exception as e:
+                outcomes.append(e)
 
-            logger.info(f"Model {model}: R² = {r_squared:.6f}")
-        except Exception as e:
-            logger.warning(f"Model {model} fitting failed: {e}")
-            failed_models.append((model, str(e)))
+    # Collect in submission order so ties resolve the same way on every run
+    for (model, params), outcome in zip(models, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Model {model} fitting failed: {outcome}")
+            failed_models.append((model, str(outcome)))
             continue
 
+        fitted_params, r_squared = outcome
+        # Worker processes fit a pickled copy; write the values back
+        if fitted_params is not params:
+            params.update(fitted_params)
+
+        if r_squared > best_r_squared:
+            best_r_squared = r_squared
+            best_model = (model, r_squared)
+            best_params = params
+
+        logger.info(f"Model {model}: R² = {r_squared:.6f}")
+
     if best_model is None:
         error_summary = "\n".join([f"  - {m}: {e}" for m, e in failed_models])
         warnings.warn(
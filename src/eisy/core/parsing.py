@@ -1,6 +1,9 @@
+from functools import lru_cache
+
 import numpy as np
-from scipy.optimize import curve_fit
+from scipy.optimize import least_squares
 
+from .compiled import ELEMENT_OPCODES, HAVE_NUMBA, PARALLEL, SERIES, eval_residuals
 from .elements import (
     CPE,
     Capacitor,
@@ -10,14 +13,73 @@ from .elements import (
     Warburg,
     WarburgOpen,
     WarburgShort,
+    frequency_context,
 )
+from .specialized import SPECIALIZED_KERNELS
 
 
 class CircuitNode:
-    def impedance(self, frequency: float, params) -> complex:
+    def impedance(self, frequency: float, params, ctx: dict = None) -> complex:
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def impedance_with_grad(self, frequency: float, params, ctx: dict = None) -> tuple:
+        """
+        Compute the impedance together with its parameter derivatives.
+
+        Args:
+            frequency (float or array): Frequency value(s) in Hz.
+            params (dict): Parameter values keyed by element.
+            ctx (dict, optional): Precomputed frequency_context(frequency).
+
+        Returns:
+            tuple: (Z, grads) where grads maps each element key to a list of
+            dZ/dp arrays, one per scalar parameter of that element.
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def compile(self, offsets: dict) -> tuple:
+        """
+        Linearize the tree into a postfix program for the compiled evaluators.
+
+        Args:
+            offsets (dict): Offset of each element's first parameter in the
+                flat parameter vector, keyed by element.
+
+        Returns:
+            tuple: (ops, args) integer arrays.
+        """
+        program = []
+        self._emit(offsets, program)
+        ops, args = zip(*program)
+        return np.array(ops, dtype=np.int64), np.array(args, dtype=np.int64)
+
+    def _emit(self, offsets: dict, program: list) -> None:
         raise NotImplementedError("Subclasses should implement this method.")
 
-    def fit(self, freq, Z_exp, params, eps=1e-12) -> tuple:
+    def _specialized_kernel(self):
+        """Return the SPECIALIZED_KERNELS entry for this topology, or None."""
+        # Derived from the structure only, so it is safe to memoize on shared trees
+        try:
+            return self._kernel
+        except AttributeError:
+            self._kernel = _find_specialized_kernel(self)
+            return self._kernel
+
+    def fit(self, freq, Z_exp, params, eps=1e-12, loss="linear") -> tuple:
+        """
+        Fit the circuit parameters to experimental impedance data.
+
+        Args:
+            freq (array): Array of frequency values.
+            Z_exp (array): Array of experimental impedance values (complex numbers).
+            params (dict): Initial guess, updated in place with the fitted values.
+            eps (float): Lower bound for all parameters. Defaults to 1e-12.
+            loss (str): Loss function passed to scipy.optimize.least_squares,
+                e.g. "soft_l1" for robust fitting of noisy data. Defaults to "linear".
+
+        Returns:
+            tuple: (params, r_squared)
+        """
         # Prepare a flattened initial guess p0 and a structure map to reconstruct nested params
         keys = sorted(params.keys())
         p0 = []
@@ -45,45 +107,104 @@ class CircuitNode:
                 upper_bounds.append(np.inf)
                 structure.append((key, 1))
 
-        def model_wrapper(frequency, *param_values):
+        # Precompute (key, start, length) offsets into the flat parameter vector
+        starts = np.cumsum([0] + [length for _, length in structure]).tolist()
+        slices = [
+            (key, start, length) for (key, length), start in zip(structure, starts)
+        ]
+        # Scalar parameters index a single value, tuple parameters take a slice
+        indexers = [
+            (key, start if length == 1 else slice(start, start + length))
+            for key, start, length in slices
+        ]
+
+        def rebuild(param_values):
             # Rebuild param dict according to the original nested structure
-            param_values = list(param_values)
-            param_dict = {}
-            idx = 0
-            for key, length in structure:
-                if length == 1:
-                    param_dict[key] = param_values[idx]
-                    idx += 1
-                else:
-                    param_dict[key] = tuple(param_values[idx : idx + length])
-                    idx += length
-            Z_model = self.impedance(frequency, param_dict)
-            return np.concatenate((np.real(Z_model), np.imag(Z_model)))
+            return {key: param_values[index] for key, index in indexers}
+
+        # Frequency-dependent terms are shared by every evaluation during the fit
+        freq = np.asarray(freq, dtype=float)
+        ctx = frequency_context(freq)
 
         Z_real = np.real(Z_exp)
         Z_imag = np.imag(Z_exp)
         Z_combined = np.concatenate((Z_real, Z_imag))
+        N = len(Z_real)
+
+        kernel = self._specialized_kernel()
+        if kernel is not None:
+            # Known topology: evaluate its closed-form kernel directly
+            func, kernel_keys = kernel
+            offsets = {key: (start, length) for key, start, length in slices}
+            index = [
+                i
+                for key in kernel_keys
+                for i in range(offsets[key][0], offsets[key][0] + offsets[key][1])
+            ]
+            omega = ctx["omega"]
+
+            def fill_residuals(param_values, out):
+                Z_model = func(omega, *param_values[index])
+                _split_residuals(Z_model, Z_real, Z_imag, out)
+
+        elif HAVE_NUMBA:
+            # The compiled program writes real/imag parts straight into `out`
+            ops, args = self.compile({key: start for key, start, _ in slices})
+            omega = ctx["omega"]
+            stack = np.empty((len(ops), N), dtype=complex)
+
+            def fill_residuals(param_values, out):
+                eval_residuals(
+                    ops, args, param_values, omega, Z_real, Z_imag, stack, out
+                )
+
+        else:
+
+            def fill_residuals(param_values, out):
+                Z_model = self.impedance(freq, rebuild(param_values), ctx)
+                _split_residuals(Z_model, Z_real, Z_imag, out)
+
+        def residuals(param_values):
+            # Write straight into one 2N vector instead of concatenating temporaries.
+            # It cannot be reused across calls: least_squares keeps previous ones.
+            out = np.empty(2 * N)
+            fill_residuals(param_values, out)
+            return out
+
+        def jacobian(param_values):
+            _, grads = self.impedance_with_grad(freq, rebuild(param_values), ctx)
+            jac = np.zeros((2 * N, len(param_values)))
+            for key, start, length in slices:
+                for k, dZ in enumerate(grads.get(key, ())):
+                    jac[:N, start + k] = np.real(dZ)
+                    jac[N:, start + k] = np.imag(dZ)
+            return jac
+
+        # enforce positivity: set lower bounds to small positive epsilon, upper to +inf.
+        # Trial steps can hit zero/overflowing parameters; skip the warning machinery.
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            result = least_squares(
+                residuals,
+                np.asarray(p0, dtype=float),
+                jac=jacobian,
+                bounds=(lower_bounds, upper_bounds),
+                method="trf",
+                x_scale="jac",
+                loss=loss,
+            )
+        popt = result.x
 
-        # enforce positivity: set lower bounds to small positive epsilon, upper to +inf
-        popt, _ = curve_fit(
-            model_wrapper, freq, Z_combined, p0=p0, bounds=(lower_bounds, upper_bounds)
-        )
         # Calculate R^2
-        Z_fit_combined = model_wrapper(freq, *popt)
-        residuals = Z_combined - Z_fit_combined
-        ss_res = np.sum(residuals**2)
+        ss_res = np.sum(result.fun**2)
         ss_tot = np.sum((Z_combined - np.mean(Z_combined)) ** 2)
         r_squared = 1 - (ss_res / ss_tot)
 
         # Update params with fitted values, reconstructing nested structures
-        idx = 0
-        for key, length in structure:
+        for key, start, length in slices:
             if length == 1:
-                params[key] = popt[idx]
-                idx += 1
+                params[key] = popt[start]
             else:
-                params[key] = tuple(popt[idx : idx + length])
-                idx += length
+                params[key] = tuple(popt[start : start + length])
 
         return params, r_squared
 
@@ -92,8 +213,18 @@ class ElementNode(CircuitNode):
     def __init__(self, element: CircuitElement):
         self.element = element
 
-    def impedance(self, frequency: float, params) -> complex:
-        return self.element.impedance(frequency, params[self.element.__str__()])
+    def impedance(self, frequency: float, params, ctx: dict = None) -> complex:
+        return self.element.impedance(frequency, params[self.element.__str__()], ctx)
+
+    def impedance_with_grad(self, frequency: float, params, ctx: dict = None) -> tuple:
+        key = self.element.__str__()
+        Z, grad = self.element.impedance_and_gradient(frequency, params[key], ctx)
+        return Z, {key: list(grad)}
+
+    def _emit(self, offsets: dict, program: list) -> None:
+        program.append(
+            (ELEMENT_OPCODES[type(self.element)], offsets[str(self.element)])
+        )
 
     def __str__(self):
         return str(self.element)
@@ -106,11 +237,33 @@ class SeriesNode(CircuitNode):
     def __init__(self, children):
         self.children = children
 
-    def impedance(self, frequency: float, params) -> complex:
-        total_impedance = sum(
-            child.impedance(frequency, params) for child in self.children
-        )
-        return total_impedance
+    def impedance(self, frequency: float, params, ctx: dict = None) -> complex:
+        Z = _specialized_impedance(self, frequency, params, ctx)
+        if Z is not None:
+            return Z
+        if ctx is None:
+            ctx = frequency_context(frequency)
+        total_impedance = _accumulator(ctx)
+        for child in self.children:
+            Z = child.impedance(frequency, params, ctx)
+            np.add(total_impedance, Z, out=total_impedance)
+        return total_impedance[()]
+
+    def impedance_with_grad(self, frequency: float, params, ctx: dict = None) -> tuple:
+        if ctx is None:
+            ctx = frequency_context(frequency)
+        total_impedance = _accumulator(ctx)
+        grads = {}
+        for child in self.children:
+            Z, child_grads = child.impedance_with_grad(frequency, params, ctx)
+            np.add(total_impedance, Z, out=total_impedance)
+            _merge_grads(grads, child_grads)
+        return total_impedance[()], grads
+
+    def _emit(self, offsets: dict, program: list) -> None:
+        for child in self.children:
+            child._emit(offsets, program)
+        program.append((SERIES, len(self.children)))
 
     def __str__(self):
         return "-".join(str(child) for child in self.children)
@@ -123,11 +276,37 @@ class ParallelNode(CircuitNode):
     def __init__(self, children):
         self.children = children
 
-    def impedance(self, frequency: float, params) -> complex:
-        total_admittance = sum(
-            1 / child.impedance(frequency, params) for child in self.children
+    def impedance(self, frequency: float, params, ctx: dict = None) -> complex:
+        Z = _specialized_impedance(self, frequency, params, ctx)
+        if Z is not None:
+            return Z
+        if ctx is None:
+            ctx = frequency_context(frequency)
+        return _combine_parallel(
+            [child.impedance(frequency, params, ctx) for child in self.children], ctx
         )
-        return 1 / total_admittance
+
+    def impedance_with_grad(self, frequency: float, params, ctx: dict = None) -> tuple:
+        if ctx is None:
+            ctx = frequency_context(frequency)
+        results = [
+            child.impedance_with_grad(frequency, params, ctx) for child in self.children
+        ]
+        total_impedance = _combine_parallel([Z for Z, _ in results], ctx)
+        # dZ/dp = Z^2 * sum_i (dZ_i/dp / Z_i^2)
+        grads = {}
+        for Z, child_grads in results:
+            scale = (total_impedance / Z) ** 2
+            _merge_grads(
+                grads,
+                {key: [scale * dZ for dZ in dZs] for key, dZs in child_grads.items()},
+            )
+        return total_impedance, grads
+
+    def _emit(self, offsets: dict, program: list) -> None:
+        for child in self.children:
+            child._emit(offsets, program)
+        program.append((PARALLEL, len(self.children)))
 
     def __str__(self):
         children_strs = []
@@ -157,6 +336,150 @@ class RandlesNode(SeriesNode):
         )
 
 
+def _accumulator(ctx: dict) -> np.ndarray:
+    """
+    Allocate a zeroed complex buffer matching the frequency grid of ctx.
+
+    Args:
+        ctx (dict): Frequency context from frequency_context().
+
+    Returns:
+        array: Buffer to accumulate impedances or admittances into.
+    """
+    return np.zeros(np.shape(ctx["omega"]), dtype=np.result_type(ctx["jw"]))
+
+
+def _combine_parallel(impedances: list, ctx: dict):
+    """
+    Combine branch impedances in parallel.
+
+    An infinite (open) branch contributes no admittance and a zero (shorted)
+    branch shorts the whole combination, instead of producing NaNs.
+
+    Args:
+        impedances (list): Impedance of each branch.
+        ctx (dict): Frequency context from frequency_context().
+
+    Returns:
+        complex or array: The parallel impedance.
+    """
+    # Accumulate admittances in place; numpy division also keeps scalar branches
+    # (e.g. resistors) on IEEE semantics instead of raising ZeroDivisionError
+    total_impedance = _accumulator(ctx)
+    admittance = np.empty_like(total_impedance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for Z in impedances:
+            np.divide(1, Z, out=admittance)
+            np.add(total_impedance, admittance, out=total_impedance)
+        np.divide(1, total_impedance, out=total_impedance)
+    if np.all(np.isfinite(total_impedance)):
+        return total_impedance[()]
+
+    shorted = np.zeros(total_impedance.shape, dtype=bool)
+    total_admittance = total_impedance
+    total_admittance.fill(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for Z in impedances:
+            shorted |= np.equal(Z, 0)
+            np.divide(1, Z, out=admittance)
+            admittance[np.isinf(np.broadcast_to(Z, admittance.shape))] = 0
+            np.add(total_admittance, admittance, out=total_admittance)
+        total_impedance = np.divide(1, total_admittance, out=total_admittance)
+    total_impedance[shorted] = 0
+    return total_impedance[()]
+
+
+def _find_specialized_kernel(node: CircuitNode):
+    """
+    Look up a hand-written impedance kernel for the topology of node.
+
+    Args:
+        node (CircuitNode): The circuit to match.
+
+    Returns:
+        tuple or None: (kernel, element keys) from SPECIALIZED_KERNELS, or None.
+    """
+    circuit = str(node)
+    for string, kernel in SPECIALIZED_KERNELS.items():
+        if str(parse_circuit(string)) == circuit:
+            return kernel
+    return None
+
+
+def _specialized_impedance(node: CircuitNode, frequency, params, ctx: dict = None):
+    """
+    Evaluate node with its specialized kernel, if one applies.
+
+    Kernels cover the regular case only: scalar frequencies, and parameters
+    describing open or shorted branches or an invalid CPE exponent, go through
+    the tree, which handles them explicitly.
+
+    Args:
+        node (CircuitNode): The circuit to evaluate.
+        frequency (float or array): Frequency value(s) in Hz.
+        params (dict): Parameter values.
+        ctx (dict, optional): Frequency context from frequency_context().
+
+    Returns:
+        array or None: The impedance, or None if no kernel applies.
+    """
+    if np.ndim(frequency) != 1:
+        return None
+    kernel = node._specialized_kernel()
+    if kernel is None:
+        return None
+
+    func, keys = kernel
+    args = []
+    for key in keys:
+        value = params[key]
+        if isinstance(value, (list, tuple, np.ndarray)):
+            if key.startswith("Q") and value[1] > 1:
+                return None
+            args.extend(float(v) for v in value)
+        else:
+            args.append(float(value))
+    if not all(0 < arg < np.inf for arg in args):
+        return None
+
+    if ctx is not None:
+        omega = ctx["omega"]
+    else:
+        omega = 2 * np.pi * np.asarray(frequency, dtype=float)
+    return func(omega, *args)
+
+
+def _split_residuals(Z_model, Z_real, Z_imag, out: np.ndarray) -> None:
+    """
+    Write the real and imaginary model residuals into the halves of out.
+
+    Args:
+        Z_model (complex or array): Model impedance.
+        Z_real (array): Real part of the experimental impedance.
+        Z_imag (array): Imaginary part of the experimental impedance.
+        out (array): Residual vector of length 2 * len(Z_real).
+    """
+    N = len(Z_real)
+    np.subtract(np.real(Z_model), Z_real, out=out[:N])
+    np.subtract(np.imag(Z_model), Z_imag, out=out[N:])
+
+
+def _merge_grads(grads: dict, child_grads: dict) -> None:
+    """
+    Accumulate child parameter derivatives into grads in place.
+
+    Args:
+        grads (dict): Accumulated derivatives, keyed by element.
+        child_grads (dict): Derivatives of a child node, keyed by element.
+    """
+    for key, dZs in child_grads.items():
+        if key in grads:
+            grads[key] = [a + b for a, b in zip(grads[key], dZs)]
+        else:
+            grads[key] = dZs
+
+
+@lru_cache(maxsize=512)
 def parse_circuit(string: str) -> CircuitNode:
     """
     Parses a circuit string into a CircuitNode tree.
@@ -166,6 +489,9 @@ def parse_circuit(string: str) -> CircuitNode:
     - "R1-C1" (series)
     - "R1|C1" (parallel)
     - "R1-Q1|(R2-W1)" (R1 in series with parallel of Q1 and (R2-W1))
+
+    Parsed trees are cached and shared between callers, so they must not be
+    mutated; parameter values always live in the external params dict.
     """
     string = string.strip()
 
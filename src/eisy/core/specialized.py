@@ -0,0 +1,72 @@
+"""
+Hand-written impedance kernels for the predefined circuit topologies.
+
+Each kernel evaluates the closed-form impedance of one topology over the whole
+angular frequency vector, bypassing the generic tree traversal during fitting
+and when evaluating a matching circuit on a frequency array.
+Kernels are Numba-compiled when Numba is installed and run as plain NumPy
+otherwise.
+"""
+
+import numpy as np
+
+from .compiled import njit
+
+
+@njit(cache=True, fastmath=True)
+def z_randles(omega, R1, R2, W1, C1):
+    jw = 1j * omega
+    Zw = W1 * (1 - 1j) / np.sqrt(omega)
+    return R1 + 1 / (1 / (R2 + Zw) + jw * C1)
+
+
+@njit(cache=True, fastmath=True)
+def z_randles_cpe(omega, R1, R2, W1, Q1, n):
+    jw = 1j * omega
+    Zw = W1 * (1 - 1j) / np.sqrt(omega)
+    return R1 + 1 / (1 / (R2 + Zw) + Q1 * jw**n)
+
+
+@njit(cache=True, fastmath=True)
+def z_rc_series(omega, R1, C1):
+    return R1 + 1 / (1j * omega * C1)
+
+
+@njit(cache=True, fastmath=True)
+def z_rc_parallel(omega, R1, C1):
+    return 1 / (1 / R1 + 1j * omega * C1)
+
+
+@njit(cache=True, fastmath=True)
+def z_double_rc(omega, R1, R2, C1, R3, C2):
+    jw = 1j * omega
+    return R1 + 1 / (1 / R2 + jw * C1) + 1 / (1 / R3 + jw * C2)
+
+
+@njit(cache=True, fastmath=True)
+def z_simple_randles(omega, R1, R2, C1):
+    return R1 + 1 / (1 / R2 + 1j * omega * C1)
+
+
+@njit(cache=True, fastmath=True)
+def z_simple_randles_cpe(omega, R1, R2, Q1, n):
+    return R1 + 1 / (1 / R2 + Q1 * (1j * omega) ** n)
+
+
+@njit(cache=True, fastmath=True)
+def z_rl_cpe(omega, R1, L1, Q1, n):
+    jw = 1j * omega
+    return R1 + jw * L1 + 1 / (Q1 * jw**n)
+
+
+# Circuit string -> (kernel, element keys in kernel argument order)
+SPECIALIZED_KERNELS = {
+    "R1-(R2-W1)|C1": (z_randles, ("R1", "R2", "W1", "C1")),
+    "R1-(R2-W1)|Q1": (z_randles_cpe, ("R1", "R2", "W1", "Q1")),
+    "R1-C1": (z_rc_series, ("R1", "C1")),
+    "R1|C1": (z_rc_parallel, ("R1", "C1")),
+    "R1-(R2|C1)-(R3|C2)": (z_double_rc, ("R1", "R2", "C1", "R3", "C2")),
+    "R1-(R2|C1)": (z_simple_randles, ("R1", "R2", "C1")),
+    "R1-(R2|Q1)": (z_simple_randles_cpe, ("R1", "R2", "Q1")),
+    "R1-L1-Q1": (z_rl_cpe, ("R1", "L1", "Q1")),
+}
@@ -8,7 +8,13 @@ from ..core.parsing import parse_circuit
 
 
 def generate_synthetic_data(
-    circuit_string, params, freq_min=1, freq_max=1e5, num_points=50, noise_level=0.05
+    circuit_string,
+    params,
+    freq_min=1,
+    freq_max=1e5,
+    num_points=50,
+    noise_level=0.05,
+    rng=None,
 ):
     """Generate synthetic impedance data for a given circuit.
 
@@ -19,23 +25,26 @@ def generate_synthetic_data(
         freq_max (float): Maximum frequency
         num_points (int): Number of frequency points
         noise_level (float): Relative noise level
+        rng (numpy.random.Generator, optional): Generator used for the noise.
+            Defaults to the global numpy random state.
 
     Returns:
         tuple: (frequency array, noisy impedance, true impedance)
     """
-    freq = np.logspace(np.log10(freq_min), np.log10(freq_max), num=num_points)
+    freq = np.geomspace(freq_min, freq_max, num=num_points)
 
     # Parse circuit and compute impedance
     circuit = parse_circuit(circuit_string)
-    Z = np.array([circuit.impedance(f, params) for f in freq])
+    # Resistor-only circuits evaluate to a scalar, so broadcast to the frequency grid
+    Z = np.broadcast_to(circuit.impedance(freq, params), freq.shape).astype(complex)
 
     # Add noise
     if noise_level > 0:
-        noise = (
-            noise_level
-            * np.abs(Z)
-            * (np.random.rand(len(freq)) + 1j * np.random.rand(len(freq)))
-        )
+        if rng is None:
+            unit_noise = np.random.rand(len(freq)) + 1j * np.random.rand(len(freq))
+        else:
+            unit_noise = rng.random((len(freq), 2)).view(complex)[:, 0]
+        noise = noise_level * np.abs(Z) * unit_noise
         Z_noisy = Z + noise
     else:
         Z_noisy = Z
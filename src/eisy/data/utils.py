@@ -97,10 +97,28 @@ def readLCR6100(filepath: str) -> tuple:
     """
     try:
         with open(filepath, "r") as file:
-            lines = file.readlines()
+            text = file.read()
     except IOError as e:
         raise ValueError(f"Cannot read file {filepath}: {e}")
 
+    return _readLCR6100_from_text(text)
+
+
+def _readLCR6100_from_text(text: str) -> tuple:
+    """
+    Parse the content of a Keithley LCR6100 measurement file.
+
+    Args:
+        text (str): Content of the LCR6100 measurement file.
+
+    Returns:
+        tuple: (frequency, Z_real, Z_imag) as numpy arrays.
+
+    Raises:
+        ValueError: If the file format is not recognized or data cannot be parsed.
+    """
+    lines = text.splitlines(keepends=True)
+
     # Find data section
     start_idx = None
     end_idx = None
@@ -131,9 +149,8 @@ def readLCR6100(filepath: str) -> tuple:
     df["Second"] = pd.to_numeric(df["Second"])
 
     # convert "Primary" to Ohm based on "Unit.1"
-    df.loc[df["Unit.1"] == "kohm", "Primary"] *= 1e3
-    df.loc[df["Unit.1"] == "Mohm", "Primary"] *= 1e6
-    df.loc[df["Unit.1"] == "ohm", "Primary"] *= 1
+    scale = df["Unit.1"].map({"ohm": 1.0, "kohm": 1e3, "Mohm": 1e6}).fillna(1.0)
+    df["Primary"] = df["Primary"] * scale
 
     # convert kHz to Hz
     df["Freq(kHz)"] *= 1e3
@@ -150,6 +167,55 @@ def readLCR6100(filepath: str) -> tuple:
     return df["Freq(Hz)"].to_numpy(), Z.to_numpy().real, Z.to_numpy().imag
 
 
+def _load_numeric(file_content: str):
+    """
+    Read a purely numeric comma or whitespace separated file with np.loadtxt.
+
+    A single non-numeric header row (e.g. column names) is skipped, and rows
+    with NaN or infinite values in the first three columns are dropped.
+
+    Args:
+        file_content (str): Content of the file as a string.
+
+    Returns:
+        array or None: 2D float array with at least 3 columns, or None if the
+        content is not a plain numeric table.
+    """
+    lines = file_content.splitlines()
+    data_lines = [
+        i
+        for i, line in enumerate(lines)
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    if not data_lines:
+        return None
+
+    # Drop any inline comment so a commented first data row isn't taken for a header
+    first_line = lines[data_lines[0]].split("#", 1)[0]
+    delimiter = "," if "," in first_line else None
+    try:
+        [float(value) for value in first_line.split(delimiter)]
+        start = 0
+    except ValueError:
+        # Header row: read everything after it
+        if len(data_lines) < 2:
+            return None
+        start = data_lines[0] + 1
+
+    try:
+        data = np.loadtxt(lines[start:], delimiter=delimiter, comments="#", ndmin=2)
+    except ValueError:
+        return None
+
+    if data.shape[1] < 3:
+        return None
+    # Like the pandas path, drop rows with missing or non-finite values
+    data = data[np.isfinite(data[:, :3]).all(axis=1)]
+    if len(data) == 0:
+        return None
+    return data
+
+
 def parse_data_file(file_content: str, filename: str = "") -> tuple:
     """
     Parse impedance data from various file formats.
@@ -170,26 +236,15 @@ def parse_data_file(file_content: str, filename: str = "") -> tuple:
     """
     # Check if it's an LCR6100 file
     if "**********List_Meas_Result**********" in file_content:
-        import tempfile
-
-        # Use BytesIO
         try:
-            # Still need temp file for readLCR6100 compatibility
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".txt", encoding="utf-8"
-            ) as tmp:
-                tmp.write(file_content)
-                tmp_path = tmp.name
-
-            freq, Z_real, Z_imag = readLCR6100(tmp_path)
-            return freq, Z_real, Z_imag
+            return _readLCR6100_from_text(file_content)
         except Exception as e:
             raise ValueError(f"Failed to parse LCR-6100 file: {e}")
-        finally:
-            import os
 
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    # Fast path: purely numeric files are read by numpy's C parser
+    data = _load_numeric(file_content)
+    if data is not None:
+        return data[:, 0], data[:, 1], data[:, 2]
 
     # Try parsing as csv/txt with frequency, Z_real, Z_imag format
     delimiters_tried = []
@@ -212,9 +267,11 @@ def parse_data_file(file_content: str, filename: str = "") -> tuple:
                 impedance_real = pd.to_numeric(df.iloc[:, 1], errors="coerce")
                 impedance_imag = pd.to_numeric(df.iloc[:, 2], errors="coerce")
 
-                # Drop rows with NaN values
-                valid_mask = ~(
-                    frequency.isna() | impedance_real.isna() | impedance_imag.isna()
+                # Drop rows with missing or non-finite values
+                valid_mask = (
+                    np.isfinite(frequency)
+                    & np.isfinite(impedance_real)
+                    & np.isfinite(impedance_imag)
                 )
 
                 frequency = frequency[valid_mask]
@@ -0,0 +1,46 @@
+"""
+orjson-backed JSON provider for the Flask app
+"""
+
+import numpy as np
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Serialize and parse JSON with orjson.
+
+    NumPy arrays and scalars are encoded natively, so routes can return them
+    without converting to lists first. Non-finite floats are encoded as null.
+    """
+
+    def _default(self, obj):
+        # orjson only encodes C-contiguous arrays of real dtypes natively and
+        # hands anything else (views, strided slices) to default
+        if isinstance(obj, np.ndarray):
+            if obj.flags.c_contiguous:
+                return obj.tolist()
+            return np.ascontiguousarray(obj)
+        return self.default(obj)
+
+    def _dumps(self, obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self._default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._dumps(obj, bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        # Pass bytes straight through instead of decoding to str and re-encoding
+        return self._app.response_class(
+            self._dumps(obj, indent) + b"\n", mimetype=self.mimetype
+        )
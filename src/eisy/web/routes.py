@@ -2,10 +2,22 @@
 API routes
 """
 
+import hashlib
 import io
-import traceback
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
+import orjson
 from flask import jsonify, request, send_file
 
 from ..core.parsing import parse_circuit
@@ -14,15 +26,295 @@ from ..data.utils import parse_data_file
 from .validation import validate_circuit_string
 from .web_utils import internal_to_web_params, web_to_internal_params
 
+logger = logging.getLogger(__name__)
+
+# Largest spectrum accepted by the API, to bound per-request allocations
+MAX_POINTS = 100_000
+
+_pool = None
+_pool_lock = threading.Lock()
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+# LRU cache of fit results: key from _fit_cache_key -> _fit_payload() dict
+_FIT_CACHE = OrderedDict()
+_FIT_CACHE_SIZE = 64
+_FIT_PAYLOAD_KEYS = (
+    "fitted_params",
+    "r_squared",
+    "frequency",
+    "fitted_real",
+    "fitted_imag",
+)
+_fit_cache_lock = threading.Lock()
+
+
+def _json():
+    """Parse the JSON body of the current request with orjson.
+
+    The raw body is not cached on the request, since it is only read once.
+    """
+    return orjson.loads(request.get_data(cache=False))
+
+
+def _too_many_points():
+    """Build the error response for spectra longer than MAX_POINTS."""
+    return jsonify(
+        {"success": False, "error": f"Too many points (max {MAX_POINTS})"}
+    ), 413
+
+
+def _get_pool(broken=None):
+    """Return the process pool shared by all multi-model fit requests.
+
+    The pool is created on first use rather than at import, so importing the
+    app (e.g. under the reloader) does not spawn workers. Workers are started
+    by a forkserver (spawn where unavailable) rather than forked from the
+    threaded server, so they cannot inherit locks held by other threads.
+
+    Args:
+        broken (ProcessPoolExecutor, optional): A pool found to be broken; it
+            is shut down and replaced unless another request already did so.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool is broken:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=_POOL_CONTEXT
+            )
+        return _pool
+
+
+def _pool_map(fn, *iterables):
+    """Map fn over the iterables in the shared pool.
+
+    If a worker died and broke the pool, the pool is rebuilt and the calls
+    are retried once.
+
+    Returns:
+        list: The results, in input order
+    """
+    # Materialize the calls so they can be replayed on retry
+    calls = list(zip(*iterables))
+    pool = _get_pool()
+    try:
+        return list(pool.map(fn, *zip(*calls)))
+    except BrokenProcessPool:
+        logger.warning("Process pool broke, rebuilding it and retrying")
+        return list(_get_pool(broken=pool).map(fn, *zip(*calls)))
+
+
+def _fit_cache_key(circuit_string, param_names, initial_guess, freq, Z_exp):
+    """Build the fit cache key for a circuit and initial guess on a dataset.
+
+    Args:
+        circuit_string (str): Circuit definition string
+        param_names (list): Parameter names in web format
+        initial_guess (dict): Initial parameters in web format
+        freq (array): Frequency values
+        Z_exp (array): Experimental impedance values
+
+    Returns:
+        bytes: Digest identifying the fit
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        orjson.dumps(
+            [circuit_string, param_names, initial_guess, len(freq)],
+            option=orjson.OPT_SORT_KEYS,
+        )
+    )
+    digest.update(np.ascontiguousarray(freq, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(Z_exp, dtype=complex).tobytes())
+    return digest.digest()
+
+
+def _fit_cache_get(key):
+    """Return the cached fit payload for key, or None."""
+    with _fit_cache_lock:
+        payload = _FIT_CACHE.get(key)
+        if payload is not None:
+            _FIT_CACHE.move_to_end(key)
+        return payload
+
+
+def _fit_cache_put(key, payload):
+    """Store a fit payload, evicting the least recently used entries."""
+    with _fit_cache_lock:
+        _FIT_CACHE[key] = payload
+        _FIT_CACHE.move_to_end(key)
+        while len(_FIT_CACHE) > _FIT_CACHE_SIZE:
+            _FIT_CACHE.popitem(last=False)
+
+
+def _fit_payload(circuit_string, param_names, initial_guess, freq, Z_exp):
+    """Fit a circuit and build the response fields shared by the fit routes.
+
+    Args:
+        circuit_string (str): Circuit definition string
+        param_names (list): Parameter names in web format
+        initial_guess (dict): Initial parameters in web format
+        freq (array): Frequency values
+        Z_exp (array): Experimental impedance values
+
+    Returns:
+        dict: Fitted parameters (web format), R² and fitted impedance
+    """
+    # Convert parameters from web format to circuit format
+    initial_params = web_to_internal_params(initial_guess, param_names)
+
+    # Parse circuit and fit
+    circuit = parse_circuit(circuit_string)
+    fitted_params, r_squared = circuit.fit(freq, Z_exp, initial_params)
+
+    # Generate fitted impedance
+    Z_fit = np.broadcast_to(circuit.impedance(freq, fitted_params), freq.shape)
+
+    return {
+        # Convert fitted params back to web format
+        "fitted_params": internal_to_web_params(fitted_params),
+        "r_squared": float(r_squared),
+        "frequency": freq,
+        "fitted_real": Z_fit.real,
+        "fitted_imag": Z_fit.imag,
+    }
+
+
+def _fit_one_model(freq, Z_exp, model_config, idx):
+    """Fit one model of a fit_models request (runs in a worker process).
+
+    Args:
+        freq (array): Frequency values
+        Z_exp (array): Experimental impedance values
+        model_config (dict): Model configuration from the request
+        idx (int): Position of the model in the request, used for its default name
+
+    Returns:
+        dict: Result entry for the response
+    """
+    try:
+        payload = _fit_payload(
+            model_config["circuit"],
+            model_config["param_names"],
+            model_config["initial_guess"],
+            freq,
+            Z_exp,
+        )
+        return {
+            "success": True,
+            "model_name": model_config.get("name", f"Model {idx + 1}"),
+            "circuit": model_config["circuit"],
+            **payload,
+        }
+
+    except Exception as e:
+        # Keep the traceback in the server log, the client only gets its ID
+        error_id = uuid.uuid4().hex
+        logger.exception("Fitting model %s failed (error %s)", idx + 1, error_id)
+        return {
+            "success": False,
+            "model_name": model_config.get("name", f"Model {idx + 1}"),
+            "circuit": model_config["circuit"],
+            "error": str(e),
+            "error_id": error_id,
+        }
+
+
+def _share_array(array):
+    """Copy an array into a new shared memory block.
+
+    Args:
+        array (array): Array to share
+
+    Returns:
+        tuple: (SharedMemory, descriptor), where the (name, shape, dtype)
+        descriptor lets worker processes attach with _attach_array
+    """
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_array(descriptor):
+    """Attach to an array shared with _share_array, without copying it.
+
+    Args:
+        descriptor (tuple): (name, shape, dtype) from _share_array
+
+    Returns:
+        tuple: (SharedMemory, array view into the block)
+    """
+    name, shape, dtype = descriptor
+    if sys.version_info >= (3, 13):
+        # Only the creating process should track and unlink the block
+        shm = SharedMemory(name=name, track=False)
+    else:
+        # Pool workers share the parent's resource tracker, which already
+        # tracks the block, so attaching again does not double-register it
+        shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _fit_one_model_shared(freq_block, Z_block, model_config, idx):
+    """Run _fit_one_model on request data shared by the parent process.
+
+    The frequency is left out of the result since the parent already has
+    it, and no view into the shared blocks may outlive them.
+
+    Args:
+        freq_block (tuple): Descriptor of the shared frequency values
+        Z_block (tuple): Descriptor of the shared impedance values
+        model_config (dict): Model configuration from the request
+        idx (int): Position of the model in the request
+
+    Returns:
+        dict: Result entry for the response, without "frequency"
+    """
+    freq_shm, freq = _attach_array(freq_block)
+    Z_shm, Z_exp = _attach_array(Z_block)
+    try:
+        result = _fit_one_model(freq, Z_exp, model_config, idx)
+        result.pop("frequency", None)
+        return result
+    finally:
+        del freq, Z_exp
+        freq_shm.close()
+        Z_shm.close()
+
 
 def register_routes(app):
     """Register all API routes with the Flask app."""
+
+    def error_response(e, status=400):
+        """Log the current exception under a new ID and return it to the client."""
+        error_id = uuid.uuid4().hex
+        app.logger.exception("Request %s failed", error_id)
+        return jsonify(
+            {"success": False, "error": str(e), "error_id": error_id}
+        ), status
+
+    @app.before_request
+    def reject_oversized_body():
+        """Reject bodies over MAX_CONTENT_LENGTH before a route reads them."""
+        max_length = app.config.get("MAX_CONTENT_LENGTH")
+        if max_length is not None and (request.content_length or 0) > max_length:
+            return jsonify({"success": False, "error": "Request body too large"}), 413
     
     @app.route("/api/generate_data", methods=["POST"])
     def generate_data():
         """Generate synthetic impedance data."""
         try:
-            data = request.json
+            data = _json()
             
             # Validate inputs
             circuit_string = data.get("circuit")
@@ -47,6 +339,9 @@ def register_routes(app):
                     "success": False, 
                     "error": "num_points must be at least 2"
                 }), 400
+
+            if num_points > MAX_POINTS:
+                return _too_many_points()
             
             if not 0 <= noise_level <= 1:
                 return jsonify({
@@ -55,8 +350,7 @@ def register_routes(app):
                 }), 400
             
             # Convert web format params to circuit format
-            param_names = list(params.keys())
-            params = web_to_internal_params(params, param_names)
+            params = web_to_internal_params(params)
 
             freq, Z_noisy, Z_true = generate_synthetic_data(
                 circuit_string, params, freq_min, freq_max, num_points, noise_level
@@ -65,11 +359,11 @@ def register_routes(app):
             return jsonify(
                 {
                     "success": True,
-                    "frequency": freq.tolist(),
-                    "impedance_real": np.real(Z_noisy).tolist(),
-                    "impedance_imag": np.imag(Z_noisy).tolist(),
-                    "true_real": np.real(Z_true).tolist(),
-                    "true_imag": np.imag(Z_true).tolist(),
+                    "frequency": freq,
+                    "impedance_real": Z_noisy.real,
+                    "impedance_imag": Z_noisy.imag,
+                    "true_real": Z_true.real,
+                    "true_imag": Z_true.imag,
                 }
             )
         except ValueError as e:
@@ -85,7 +379,9 @@ def register_routes(app):
     def fit_models_api():
         """Fit multiple circuit models to impedance data and find the best one."""
         try:
-            data = request.json
+            data = _json()
+            if len(data["frequency"]) > MAX_POINTS:
+                return _too_many_points()
             freq = np.array(data["frequency"])
             Z_exp_real = np.array(data["impedance_real"])
             Z_exp_imag = np.array(data["impedance_imag"])
@@ -93,60 +389,71 @@ def register_routes(app):
 
             models_to_fit = data["models"]  # List of model configurations
 
-            results = []
-            best_r2 = -np.inf
-            best_model_idx = 0
+            # Serve repeated fits from the cache, fit the rest
+            keys = [
+                _fit_cache_key(
+                    model_config.get("circuit"),
+                    model_config.get("param_names"),
+                    model_config.get("initial_guess"),
+                    freq,
+                    Z_exp,
+                )
+                for model_config in models_to_fit
+            ]
+            results = [None] * len(models_to_fit)
+            misses = []
+            for idx, (model_config, key) in enumerate(zip(models_to_fit, keys)):
+                payload = _fit_cache_get(key)
+                if payload is None:
+                    misses.append(idx)
+                    continue
+                results[idx] = {
+                    "success": True,
+                    "model_name": model_config.get("name", f"Model {idx + 1}"),
+                    "circuit": model_config["circuit"],
+                    **payload,
+                }
 
-            for idx, model_config in enumerate(models_to_fit):
+            # Fits are independent and CPU-bound, so run them across processes.
+            # Workers read the data from shared memory instead of a pickle per model.
+            if misses:
+                shared = []
                 try:
-                    circuit_string = model_config["circuit"]
-                    param_names = model_config["param_names"]
-
-                    # Convert parameters from web format to circuit format
-                    initial_params = web_to_internal_params(
-                        model_config["initial_guess"], param_names
-                    )
-
-                    # Parse circuit and fit
-                    circuit = parse_circuit(circuit_string)
-                    fitted_params, r_squared = circuit.fit(freq, Z_exp, initial_params)
-
-                    # Generate fitted impedance
-                    Z_fit = np.array(
-                        [circuit.impedance(f, fitted_params) for f in freq]
-                    )
-
-                    # Convert fitted params back to web format
-                    fitted_params_web = internal_to_web_params(fitted_params)
-
-                    # Track best model
-                    if r_squared > best_r2:
-                        best_r2 = r_squared
-                        best_model_idx = idx
-
-                    results.append(
-                        {
-                            "success": True,
-                            "model_name": model_config.get("name", f"Model {idx + 1}"),
-                            "circuit": circuit_string,
-                            "fitted_params": fitted_params_web,
-                            "r_squared": float(r_squared),
-                            "frequency": freq.tolist(),
-                            "fitted_real": np.real(Z_fit).tolist(),
-                            "fitted_imag": np.imag(Z_fit).tolist(),
-                        }
-                    )
-
-                except Exception as e:
-                    results.append(
-                        {
-                            "success": False,
-                            "model_name": model_config.get("name", f"Model {idx + 1}"),
-                            "circuit": model_config["circuit"],
-                            "error": str(e),
-                            "traceback": traceback.format_exc(),
-                        }
+                    # One block at a time, so a failed allocation still
+                    # releases the blocks created before it
+                    for array in (freq, Z_exp):
+                        shared.append(_share_array(array))
+                    fitted = _pool_map(
+                        _fit_one_model_shared,
+                        repeat(shared[0][1]),
+                        repeat(shared[1][1]),
+                        [models_to_fit[idx] for idx in misses],
+                        misses,
                     )
+                finally:
+                    for shm, _ in shared:
+                        shm.close()
+                        shm.unlink()
+            else:
+                fitted = []
+            for idx, result in zip(misses, fitted):
+                results[idx] = result
+                if result["success"]:
+                    result["frequency"] = freq
+                    payload = {field: result[field] for field in _FIT_PAYLOAD_KEYS}
+                    _fit_cache_put(keys[idx], payload)
+
+            # First maximum wins, so ties resolve to the earliest model
+            best_model_idx = max(
+                range(len(results)),
+                key=lambda i: results[i].get("r_squared", -np.inf),
+                default=0,
+            )
+            best_r2 = (
+                results[best_model_idx].get("r_squared", -np.inf)
+                if results
+                else -np.inf
+            )
 
             return jsonify(
                 {
@@ -158,59 +465,47 @@ def register_routes(app):
             )
 
         except Exception as e:
-            return jsonify(
-                {"success": False, "error": str(e), "traceback": traceback.format_exc()}
-            ), 400
+            return error_response(e)
 
     @app.route("/api/fit_single", methods=["POST"])
     def fit_single_api():
         """Fit a single circuit model to impedance data."""
         try:
-            data = request.json
+            data = _json()
             circuit_string = data["circuit"]
+            if len(data["frequency"]) > MAX_POINTS:
+                return _too_many_points()
             freq = np.array(data["frequency"])
             Z_exp_real = np.array(data["impedance_real"])
             Z_exp_imag = np.array(data["impedance_imag"])
             Z_exp = Z_exp_real + 1j * Z_exp_imag
 
-            # Convert parameters from web format to circuit format
             param_names = data["param_names"]
-            initial_params = web_to_internal_params(data["initial_guess"], param_names)
-
-            # Parse circuit and fit
-            circuit = parse_circuit(circuit_string)
-            fitted_params, r_squared = circuit.fit(freq, Z_exp, initial_params)
-
-            # Generate fitted impedance
-            Z_fit = np.array([circuit.impedance(f, fitted_params) for f in freq])
+            initial_guess = data["initial_guess"]
 
-            # Convert fitted params back to web format
-            fitted_params_web = internal_to_web_params(fitted_params)
+            # Refits of the same model on the same data are served from the cache
+            cache_key = _fit_cache_key(
+                circuit_string, param_names, initial_guess, freq, Z_exp
+            )
+            payload = _fit_cache_get(cache_key)
+            if payload is None:
+                payload = _fit_payload(
+                    circuit_string, param_names, initial_guess, freq, Z_exp
+                )
+                _fit_cache_put(cache_key, payload)
 
             # Create param errors dict (all zeros for now, would need pcov for real errors)
-            param_errors = {key: 0.0 for key in fitted_params_web.keys()}
+            param_errors = {key: 0.0 for key in payload["fitted_params"].keys()}
 
-            return jsonify(
-                {
-                    "success": True,
-                    "fitted_params": fitted_params_web,
-                    "param_errors": param_errors,
-                    "r_squared": float(r_squared),
-                    "frequency": freq.tolist(),
-                    "fitted_real": np.real(Z_fit).tolist(),
-                    "fitted_imag": np.imag(Z_fit).tolist(),
-                }
-            )
+            return jsonify({"success": True, "param_errors": param_errors, **payload})
         except Exception as e:
-            return jsonify(
-                {"success": False, "error": str(e), "traceback": traceback.format_exc()}
-            ), 400
+            return error_response(e)
 
     @app.route("/api/validate_circuit", methods=["POST"])
     def validate_circuit():
         """Validate a circuit string."""
         try:
-            data = request.json
+            data = _json()
             circuit_string = data["circuit"]
             result = validate_circuit_string(circuit_string)
 
@@ -225,48 +520,52 @@ def register_routes(app):
     def parse_data_file_api():
         """Parse uploaded data file and return frequency and impedance data."""
         try:
-            data = request.json
+            data = _json()
             file_content = data["content"]
             filename = data.get("filename", "")
 
             freq, Z_real, Z_imag = parse_data_file(file_content, filename)
+            if len(freq) > MAX_POINTS:
+                return _too_many_points()
 
             return jsonify(
                 {
                     "success": True,
-                    "frequency": freq.tolist(),
-                    "impedance_real": Z_real.tolist(),
-                    "impedance_imag": Z_imag.tolist(),
+                    "frequency": freq,
+                    "impedance_real": Z_real,
+                    "impedance_imag": Z_imag,
                     "num_points": len(freq),
                 }
             )
         except Exception as e:
-            return jsonify(
-                {"success": False, "error": str(e), "traceback": traceback.format_exc()}
-            ), 400
+            return error_response(e)
 
     @app.route("/api/export_synthetic_csv", methods=["POST"])
     def export_synthetic_csv():
         """Generate synthetic data and return as CSV file for download."""
         try:
-            data = request.json
+            data = _json()
             circuit_string = data["circuit"]
             params_web = data["params"]
             freq_min = float(data.get("freq_min", 1))
             freq_max = float(data.get("freq_max", 1e5))
             num_points = int(data.get("num_points", 50))
             noise_level = float(data.get("noise_level", 0.05))
+            if num_points > MAX_POINTS:
+                return _too_many_points()
 
             # Convert web format params to circuit format
-            param_names = list(params_web.keys())
-            params = web_to_internal_params(params_web, param_names)
+            params = web_to_internal_params(params_web)
 
             freq, Z_noisy, Z_true = generate_synthetic_data(
                 circuit_string, params, freq_min, freq_max, num_points, noise_level
             )
 
-            # Create CSV content in memory
-            output = io.StringIO()
+            # Encode CSV content straight into the byte buffer that gets sent
+            csv_data = io.BytesIO()
+            output = io.TextIOWrapper(
+                csv_data, encoding="utf-8", newline="", write_through=True
+            )
 
             # Add metadata as comments
             output.write("# Synthetic EIS Data\n")
@@ -277,14 +576,14 @@ def register_routes(app):
             output.write(f"# Noise level: {noise_level}\n")
             output.write("#\n")
             output.write("Frequency (Hz),Z_real (Ohm),Z_imag (Ohm)\n")
-            for i in range(len(freq)):
-                output.write(
-                    f"{freq[i]:.6e},{np.real(Z_noisy[i]):.6e},{np.imag(Z_noisy[i]):.6e}\n"
-                )
+            # Format all rows in one %-operation and a single write
+            values = np.column_stack([freq, Z_noisy.real, Z_noisy.imag])
+            row_format = "%.6e,%.6e,%.6e\n"
+            output.write(row_format * len(values) % tuple(values.ravel().tolist()))
 
-            # Create BytesIO object from string
-            csv_data = io.BytesIO(output.getvalue().encode("utf-8"))
-            output.close()
+            # Release the buffer from the wrapper without closing it
+            output.detach()
+            csv_data.seek(0)
 
             # Send file
             return send_file(
@@ -295,3 +594,45 @@ def register_routes(app):
             )
         except Exception as e:
             return jsonify({"success": False, "error": str(e)}), 400
+
+    @app.route("/api/export_synthetic_npy", methods=["POST"])
+    def export_synthetic_npy():
+        """Generate synthetic data and return as a binary .npy file for download.
+
+        The array has columns frequency (Hz), Z_real (Ohm) and Z_imag (Ohm).
+        """
+        try:
+            data = _json()
+            circuit_string = data["circuit"]
+            params_web = data["params"]
+            freq_min = float(data.get("freq_min", 1))
+            freq_max = float(data.get("freq_max", 1e5))
+            num_points = int(data.get("num_points", 50))
+            noise_level = float(data.get("noise_level", 0.05))
+            if num_points > MAX_POINTS:
+                return _too_many_points()
+
+            # Convert web format params to circuit format
+            params = web_to_internal_params(params_web)
+
+            freq, Z_noisy, Z_true = generate_synthetic_data(
+                circuit_string, params, freq_min, freq_max, num_points, noise_level
+            )
+
+            # Write the raw little-endian float64 array, no text formatting
+            npy_data = io.BytesIO()
+            np.save(
+                npy_data,
+                np.column_stack([freq, Z_noisy.real, Z_noisy.imag]).astype("<f8"),
+            )
+            npy_data.seek(0)
+
+            # Send file
+            return send_file(
+                npy_data,
+                mimetype="application/octet-stream",
+                as_attachment=True,
+                download_name="synthetic_eis_data.npy",
+            )
+        except Exception as e:
+            return jsonify({"success": False, "error": str(e)}), 400
@@ -3,9 +3,12 @@ Circuit validation utilities.
 """
 
 import re
+from functools import lru_cache
 
 from ..core.parsing import parse_circuit
 
+_ELEM_RE = re.compile(r"[RCLWQSO]\d+")
+
 
 def validate_circuit_string(circuit_string):
     """Validate a circuit string and extract parameter information.
@@ -20,12 +23,33 @@ def validate_circuit_string(circuit_string):
             - message (str): Success or error message
             - error (str): Error message (if invalid)
     """
+    # Non-strings can't be cache keys (and aren't circuits anyway)
+    if not isinstance(circuit_string, str):
+        return {
+            "valid": False,
+            "error": "Invalid circuit: expected a string, got "
+            f"{type(circuit_string).__name__}",
+        }
+    valid, param_names, message = _validate_cached(circuit_string)
+    # Build a fresh dict so callers can't mutate the cached result
+    if valid:
+        return {"valid": True, "params": list(param_names), "message": message}
+    return {"valid": False, "error": message}
+
+
+@lru_cache(maxsize=256)
+def _validate_cached(circuit_string):
+    """Validate a circuit string, caching the result per unique string.
+
+    Returns:
+        tuple: (valid, parameter names, success or error message)
+    """
     try:
         # Try to parse to validate syntax
         parse_circuit(circuit_string)
 
         # Extract element names from circuit string
-        elements = re.findall(r"[RCLWQSO]\d+", circuit_string)
+        elements = _ELEM_RE.findall(circuit_string)
 
         # Extract parameter names
         param_names = []
@@ -41,16 +65,10 @@ def validate_circuit_string(circuit_string):
             else:
                 param_names.append(elem)
 
-        return {
-            "valid": True,
-            "params": param_names,
-            "message": f"Valid circuit! Found parameters: {', '.join(param_names)}",
-        }
+        message = f"Valid circuit! Found parameters: {', '.join(param_names)}"
+        return True, tuple(param_names), message
     except Exception as e:
-        return {
-            "valid": False,
-            "error": f"Invalid circuit: {str(e)}",
-        }
+        return False, (), f"Invalid circuit: {str(e)}"
 
 
 def validate_frequency_range(freq_min: float, freq_max: float, num_points: int) -> None:
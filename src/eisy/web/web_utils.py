@@ -2,8 +2,11 @@
 Parameter conversion utilities for web API
 """
 
+# Suffixes of the second web parameter of two-parameter elements (CPE, Warburg S/O)
+_SECONDARY_SUFFIXES = ("_n", "_B")
 
-def web_to_internal_params(params_web, param_names):
+
+def web_to_internal_params(params_web, param_names=None):
     """Convert parameters from web format to internal circuit format.
 
     Web format has CPE parameters as separate Q and n values.
@@ -11,39 +14,29 @@ def web_to_internal_params(params_web, param_names):
 
     Args:
         params_web (dict): Parameters in web format
-        param_names (list): List of parameter names
+        param_names (list, optional): List of parameter names. Defaults to
+            all keys of params_web.
 
     Returns:
         dict: Parameters in internal format
     """
+    if param_names is None:
+        param_names = params_web
     params = {}
-    i = 0
-    while i < len(param_names):
-        key = param_names[i]
-        if key.endswith("_n"):
-            # Skip _n parameters, they're handled with Q parameters
-            i += 1
+    for key in param_names:
+        if key.endswith(_SECONDARY_SUFFIXES):
+            # Skip _n/_B parameters, they're handled with their main parameter
             continue
-        if key.endswith("_B"):
-            # Warburg Short/Open B parameter
-            i += 1
-        elif key[0] == "Q":
+        value = float(params_web[key])
+        kind = key[0]
+        if kind == "Q":
             # CPE parameter - combine Q and n
-            q_value = float(params_web[key])
-            n_key = f"{key}_n"
-            n_value = float(params_web.get(n_key, 0.9))
-            params[key] = (q_value, n_value)
-            i += 1
-        elif key[0] == "S" or key[0] == "O":
+            params[key] = (value, float(params_web.get(f"{key}_n", 0.9)))
+        elif kind in "SO":
             # Warburg Short/Open parameters - combine Aw and B
-            aw_value = float(params_web[key])
-            b_key = f"{key}_B"
-            b_value = float(params_web[b_key])
-            params[key] = (aw_value, b_value)
-            i += 1
+            params[key] = (value, float(params_web[f"{key}_B"]))
         else:
-            params[key] = float(params_web[key])
-            i += 1
+            params[key] = value
     return params
 
 